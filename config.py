@@ -1,5 +1,24 @@
+import logging
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings
 
+_LOGGING_CONFIGURED = False
+
+
+def setup_logging(level: int = logging.INFO):
+    """Configure root logging once per process.
+
+    Entrypoints (scripts, API, Celery workers) call this; library modules
+    just take logging.getLogger(__name__) and inherit the configuration,
+    so imports stop paying a redundant basicConfig per module.
+    """
+    global _LOGGING_CONFIGURED
+    if _LOGGING_CONFIGURED:
+        return
+    logging.basicConfig(level=level)
+    _LOGGING_CONFIGURED = True
+
 
 class Settings(BaseSettings):
     """
@@ -44,4 +63,14 @@ class Settings(BaseSettings):
         case_sensitive = False
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide Settings instance.
+
+    Constructing Settings re-reads .env and validates every field; caching
+    makes repeated lookups (workers, scripts, tests) pay that cost once.
+    """
+    return Settings()
+
+
+settings = get_settings()
@@ -4,37 +4,139 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from src.database.database import SessionLocal
 from src.database.models import TrainingData
-from datasets import load_dataset
+from src.model_training.retraining_pipeline import prepared_dataset_path
+from src.model_training.trainer import sentiment_to_label
+from src.preprocessing.text_processor import preprocess_for_model
+from config import settings, setup_logging
+from datasets import Dataset, load_dataset
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from transformers import AutoTokenizer
+import csv
+import io
+import itertools
 import logging
 
-logging.basicConfig(level=logging.INFO)
+setup_logging()
 logger = logging.getLogger(__name__)
 
+INSERT_BATCH_SIZE = 1000
+SENTIMENT_MAP = {0: 'negative', 2: 'neutral', 4: 'positive'}
+# Source columns to drop from sentiment140 records. 'text' must stay off
+# this list: IterableDataset.map deletes remove_columns AFTER merging the
+# function output (unlike Dataset.map), so listing it would also delete
+# the text column _to_training_rows re-emits.
+SENTIMENT140_DROP_COLUMNS = ['date', 'user', 'sentiment', 'query']
+SENTIMENT140_SAMPLES = 10000
+
+
+def _to_training_rows(batch: dict) -> dict:
+    """Map a batch of sentiment140 records to TrainingData columns."""
+    return {
+        'text': batch['text'],
+        'label': [SENTIMENT_MAP.get(s, 'neutral') for s in batch['sentiment']],
+        'source': ['sentiment140'] * len(batch['text']),
+        'used_for_training': [False] * len(batch['text']),
+    }
+
+
+def _insert_training_rows(db, rows: list[dict]):
+    """Insert training rows in one statement, skipping (text, source) duplicates.
+
+    Keeps repeated dev/reload runs idempotent against the unique
+    constraint on TrainingData without pre-check SELECTs.
+    """
+    if db.get_bind().dialect.name == 'postgresql':
+        stmt = pg_insert(TrainingData.__table__).on_conflict_do_nothing(
+            index_elements=['text', 'source']
+        )
+    else:
+        stmt = insert(TrainingData.__table__)
+    db.execute(stmt, rows)
+
+
+def _copy_training_rows(db, rows: list[dict]):
+    """Bulk-load training rows with COPY FROM STDIN on Postgres.
+
+    COPY skips per-statement parse/plan overhead and is the fastest bulk
+    path Postgres offers. COPY itself cannot skip conflicts, so rows land
+    in a temp staging table and move into training_data with ON CONFLICT
+    DO NOTHING, keeping reloads idempotent. Other dialects fall back to
+    the batched INSERT.
+    """
+    if db.get_bind().dialect.name != 'postgresql':
+        _insert_training_rows(db, rows)
+        return
+
+    # CSV quoting round-trips newlines, so the text goes through verbatim
+    # and the (text, source) dedup key matches the INSERT path exactly.
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        writer.writerow([
+            row['text'],
+            row['label'],
+            row['source'],
+            row['used_for_training'],
+        ])
+    buf.seek(0)
+
+    cursor = db.connection().connection.cursor()
+    cursor.execute(
+        "CREATE TEMP TABLE IF NOT EXISTS training_data_staging "
+        "(text TEXT, label VARCHAR, source VARCHAR, used_for_training BOOLEAN)"
+    )
+    cursor.execute("TRUNCATE training_data_staging")
+    cursor.copy_expert(
+        "COPY training_data_staging (text, label, source, used_for_training) "
+        "FROM STDIN WITH CSV",
+        buf
+    )
+    cursor.execute(
+        "INSERT INTO training_data (text, label, source, used_for_training) "
+        "SELECT text, label, source, used_for_training FROM training_data_staging "
+        "ON CONFLICT (text, source) DO NOTHING"
+    )
+
 
 def load_sentiment_dataset():
     logger.info("Loading sentiment140 dataset...")
-    dataset = load_dataset("sentiment140", split="train[:10000]")
-    
+    dataset = load_dataset("sentiment140", split="train", streaming=True)
+    dataset = dataset.take(SENTIMENT140_SAMPLES)
+
+    # Streaming map is lazy (and single-process: IterableDataset has no
+    # num_proc), so each block is transformed while the previous block's
+    # INSERT is in flight and memory stays constant regardless of the
+    # sample count.
+    rows = dataset.map(
+        _to_training_rows,
+        batched=True,
+        batch_size=2000,
+        remove_columns=SENTIMENT140_DROP_COLUMNS
+    )
+
     db = SessionLocal()
     try:
         count = 0
-        for item in dataset:
-            sentiment_map = {0: 'negative', 2: 'neutral', 4: 'positive'}
-            label = sentiment_map.get(item['sentiment'], 'neutral')
-            
-            training_data = TrainingData(
-                text=item['text'],
-                label=label,
-                source='sentiment140',
-                used_for_training=False
-            )
-            db.add(training_data)
-            count += 1
-            
-            if count % 1000 == 0:
-                db.commit()
-                logger.info(f"Loaded {count} samples...")
-        
+        mappings = iter(rows)
+
+        # Smoke-check the first mapped row before inserting anything: the
+        # streaming map's column handling has changed across datasets
+        # releases, and a missing key here would otherwise surface as a
+        # rolled-back KeyError mid-load.
+        first = next(mappings, None)
+        if first is not None:
+            missing = [key for key in ('text', 'label', 'source', 'used_for_training')
+                       if key not in first]
+            if missing:
+                raise ValueError(f"Mapped sentiment140 rows are missing columns: {missing}")
+            mappings = itertools.chain([first], mappings)
+
+        while chunk := list(itertools.islice(mappings, INSERT_BATCH_SIZE)):
+            _copy_training_rows(db, chunk)
+            count += len(chunk)
+            logger.info(f"Loaded {count} samples...")
+
         db.commit()
         logger.info(f"Successfully loaded {count} training samples!")
     
@@ -60,17 +162,19 @@ def load_custom_samples():
         ("Not bad, not great. Just okay for the price.", "neutral"),
     ]
     
+    rows = [
+        {
+            'text': text,
+            'label': label,
+            'source': 'manual',
+            'used_for_training': False,
+        }
+        for text, label in samples
+    ]
+
     db = SessionLocal()
     try:
-        for text, label in samples:
-            training_data = TrainingData(
-                text=text,
-                label=label,
-                source='manual',
-                used_for_training=False
-            )
-            db.add(training_data)
-        
+        _insert_training_rows(db, rows)
         db.commit()
         logger.info(f"Successfully loaded {len(samples)} custom samples!")
     
@@ -81,6 +185,50 @@ def load_custom_samples():
         db.close()
 
 
+def pretokenize_and_cache():
+    """Tokenize the labeled training corpus once and cache it on disk.
+
+    Retraining re-tokenizes the same texts on every cycle; caching the
+    tokenized dataset as Arrow files lets the pipeline load it back
+    memory-mapped and skip tokenization entirely on the hot path.
+    """
+    logger.info("Pre-tokenizing training data...")
+
+    db = SessionLocal()
+    try:
+        training_data = db.query(TrainingData).filter(
+            TrainingData.label.isnot(None)
+        ).all()
+    finally:
+        db.close()
+
+    if not training_data:
+        logger.warning("No labeled training data to pre-tokenize")
+        return
+
+    texts = [preprocess_for_model(item.text) for item in training_data]
+    labels = [sentiment_to_label(item.label) for item in training_data]
+
+    tokenizer = AutoTokenizer.from_pretrained(settings.model_name)
+    dataset = Dataset.from_dict({'text': texts, 'label': labels})
+    dataset = dataset.map(
+        lambda batch: tokenizer(
+            batch['text'],
+            truncation=True,
+            max_length=settings.max_length,
+            padding=False
+        ),
+        batched=True,
+        batch_size=1000,
+        num_proc=os.cpu_count()
+    )
+
+    path = prepared_dataset_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    dataset.save_to_disk(str(path))
+    logger.info(f"Cached {len(dataset)} pre-tokenized samples at {path}")
+
+
 def main():
     import argparse
     parser = argparse.ArgumentParser(description='Load sample data for training')
@@ -98,6 +246,11 @@ def main():
     if args.source in ['custom', 'both']:
         load_custom_samples()
 
+    try:
+        pretokenize_and_cache()
+    except Exception as e:
+        logger.error(f"Failed to pre-tokenize training data: {e}")
+
 
 if __name__ == "__main__":
     main()
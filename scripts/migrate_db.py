@@ -0,0 +1,60 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import text
+
+from src.database.database import engine
+from config import settings, setup_logging
+import logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+# Idempotent DDL for databases created before the dedup constraint, the
+# partial index on unused training rows, and the server-side created_at
+# defaults existed. create_all only creates missing tables, so existing
+# deployments need these applied explicitly.
+#
+# The unique constraint is created as a unique index: it enforces the same
+# invariant, ON CONFLICT (text, source) resolves against it, and Postgres
+# supports IF NOT EXISTS for indexes but not for constraints.
+MIGRATION_STATEMENTS = [
+    # Drop duplicate rows first, or the unique index cannot be built on a
+    # table populated before deduplication existed. Keeps the oldest row.
+    """
+    DELETE FROM training_data a
+    USING training_data b
+    WHERE a.id > b.id AND a.text = b.text AND a.source = b.source
+    """,
+    """
+    CREATE UNIQUE INDEX IF NOT EXISTS uq_training_data_text_source
+    ON training_data (text, source)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_training_data_unused
+    ON training_data (id)
+    WHERE used_for_training = false
+    """,
+    "ALTER TABLE posts ALTER COLUMN created_at SET DEFAULT now()",
+    "ALTER TABLE training_data ALTER COLUMN created_at SET DEFAULT now()",
+    "ALTER TABLE reddit_posts ALTER COLUMN created_at SET DEFAULT now()",
+    "ALTER TABLE model_metrics ALTER COLUMN created_at SET DEFAULT now()",
+]
+
+
+def migrate_database():
+    if not settings.database_url.startswith('postgresql'):
+        logger.info("Non-Postgres database; nothing to migrate (sqlite dev "
+                    "databases are rebuilt with init_db.py instead)")
+        return
+
+    logger.info("Applying database migrations...")
+    with engine.begin() as conn:
+        for statement in MIGRATION_STATEMENTS:
+            conn.execute(text(statement))
+    logger.info("Database migrations applied successfully!")
+
+
+if __name__ == "__main__":
+    migrate_database()
@@ -13,7 +13,9 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from src.data_ingestion.reddit_streamer import RedditStreamManager
-from config import settings
+from config import settings, setup_logging
+
+setup_logging()
 
 
 def main():
@@ -57,37 +59,42 @@ def main():
     print()
     
     manager = RedditStreamManager()
-    
-    if args.batch_fetch:
-        print(f"📦 Fetching {args.limit} hot posts...")
-        manager.get_hot_posts(
-            subreddit_names=args.subreddits,
-            limit=args.limit,
-            save_to_db=args.save_db
-        )
-        print("✅ Batch fetch completed!")
-    else:
-        print("🔄 Starting real-time stream (Press Ctrl+C to stop)...")
-        try:
-            if args.type == 'submissions':
-                manager.stream_subreddit_submissions(
-                    subreddit_names=args.subreddits,
-                    save_to_db=args.save_db
-                )
-            elif args.type == 'comments':
-                manager.stream_subreddit_comments(
-                    subreddit_names=args.subreddits,
-                    save_to_db=args.save_db
-                )
-            else:
-                manager.stream_subreddit_all(
-                    subreddit_names=args.subreddits,
-                    save_to_db=args.save_db,
-                    stream_type='both'
-                )
-        except KeyboardInterrupt:
-            print("\n⏹️  Stream stopped by user")
-            print("✅ Exiting gracefully...")
+
+    try:
+        if args.batch_fetch:
+            print(f"📦 Fetching {args.limit} hot posts...")
+            manager.get_hot_posts(
+                subreddit_names=args.subreddits,
+                limit=args.limit,
+                save_to_db=args.save_db
+            )
+            print("✅ Batch fetch completed!")
+        else:
+            print("🔄 Starting real-time stream (Press Ctrl+C to stop)...")
+            try:
+                if args.type == 'submissions':
+                    manager.stream_subreddit_submissions(
+                        subreddit_names=args.subreddits,
+                        save_to_db=args.save_db
+                    )
+                elif args.type == 'comments':
+                    manager.stream_subreddit_comments(
+                        subreddit_names=args.subreddits,
+                        save_to_db=args.save_db
+                    )
+                else:
+                    manager.stream_subreddit_all(
+                        subreddit_names=args.subreddits,
+                        save_to_db=args.save_db,
+                        stream_type='both'
+                    )
+            except KeyboardInterrupt:
+                print("\n⏹️  Stream stopped by user")
+                print("✅ Exiting gracefully...")
+    finally:
+        # Drains the listener's worker pool and any buffered posts before
+        # the process exits.
+        manager.close()
 
 
 if __name__ == "__main__":
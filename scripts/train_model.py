@@ -5,9 +5,10 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from src.model_training.retraining_pipeline import RetrainingPipeline
 from src.database.database import SessionLocal
+from config import setup_logging
 import logging
 
-logging.basicConfig(level=logging.INFO)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -12,9 +12,9 @@ from src.database.models import RedditPost, ModelMetrics
 from src.model_training.trainer import SentimentModelTrainer, label_to_sentiment
 from src.model_training.retraining_pipeline import RetrainingPipeline, DataQualityMonitor
 from src.preprocessing.text_processor import preprocess_for_model
-from config import settings
+from config import settings, setup_logging
 
-logging.basicConfig(level=logging.INFO)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 app = FastAPI(
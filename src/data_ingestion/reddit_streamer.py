@@ -1,14 +1,118 @@
 import praw
 import logging
+import pyarrow as pa
+import redis
+import threading
+import time
 from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from config import settings
 from src.database.models import RedditPost
 from src.database.database import SessionLocal
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+POST_STREAM_KEY = "reddit:posts:raw"
+POST_STREAM_MAXLEN = 1_000_000
+POST_STREAM_FIELDS = (
+    'post_id', 'text', 'title', 'created_at', 'author',
+    'subreddit', 'score', 'num_comments', 'url', 'post_type',
+)
+SEEN_POSTS_KEY = "reddit:posts:seen"
+SEEN_POSTS_ERROR_RATE = 0.001
+SEEN_POSTS_CAPACITY = 10_000_000
+# Log 1-in-N received posts; per-post INFO formatting and I/O-lock
+# acquisition dominate CPU at high stream rates.
+LOG_SAMPLE_EVERY = 256
+
+
+def _submission_to_post(submission) -> dict:
+    """Build a RedditPost mapping from a PRAW submission.
+
+    Module-level so the per-post hot path is a single tight function call
+    with only local lookups.
+    """
+    return {
+        'post_id': submission.id,
+        'text': f"{submission.title} {submission.selftext}".strip(),
+        'title': submission.title,
+        'created_at': datetime.fromtimestamp(submission.created_utc),
+        'author': str(submission.author) if submission.author else '[deleted]',
+        'subreddit': str(submission.subreddit),
+        'score': submission.score,
+        'num_comments': submission.num_comments,
+        'url': submission.url,
+        'post_type': 'submission',
+    }
+
+
+def _comment_to_post(comment) -> dict:
+    """Build a RedditPost mapping from a PRAW comment."""
+    return {
+        'post_id': comment.id,
+        'text': comment.body,
+        'title': None,
+        'created_at': datetime.fromtimestamp(comment.created_utc),
+        'author': str(comment.author) if comment.author else '[deleted]',
+        'subreddit': str(comment.subreddit),
+        'score': comment.score,
+        'num_comments': 0,
+        'url': f"https://reddit.com{comment.permalink}",
+        'post_type': 'comment',
+    }
+
+
+def insert_posts_ignore_duplicates(db, rows: list[dict]):
+    """Insert posts in one statement, skipping post_id conflicts on Postgres.
+
+    The Bloom filter has a small false-negative window (restart, Redis
+    outage), so the batched insert stays idempotent at the DB level too.
+    """
+    if db.get_bind().dialect.name == 'postgresql':
+        stmt = pg_insert(RedditPost.__table__).on_conflict_do_nothing(
+            index_elements=['post_id']
+        )
+    else:
+        stmt = insert(RedditPost.__table__)
+    db.execute(stmt, rows)
+
+
+def encode_post_fields(post_data: dict) -> dict:
+    """Flatten a post dict into the string fields a Redis stream entry needs."""
+    fields = {}
+    for key, value in post_data.items():
+        if value is None:
+            continue
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        fields[key] = str(value)
+    return fields
+
+
+def decode_post_fields(fields: dict) -> dict:
+    """Rebuild a RedditPost mapping from Redis stream entry fields.
+
+    encode_post_fields drops None values (a stream entry can't hold them),
+    so every known field absent from the entry is restored to None here -
+    executemany needs homogeneous row dicts across a batch.
+    """
+    post_data = {
+        key.decode() if isinstance(key, bytes) else key:
+        value.decode() if isinstance(value, bytes) else value
+        for key, value in fields.items()
+    }
+    if post_data.get('created_at') is not None:
+        post_data['created_at'] = datetime.fromisoformat(post_data['created_at'])
+    for key in ('score', 'num_comments'):
+        if post_data.get(key) is not None:
+            post_data[key] = int(post_data[key])
+    for key in POST_STREAM_FIELDS:
+        post_data.setdefault(key, None)
+    return post_data
+
 
 class RedditStreamListener:
     """
@@ -29,12 +133,56 @@ class RedditStreamListener:
         self,
         callback: Callable | None = None,
         save_to_db: bool = True,
+        flush_size: int = 100,
+        flush_interval: float = 5.0,
+        max_workers: int = 4,
+        max_pending_posts: int = 1000,
     ):
         self.callback = callback
         self.save_to_db = save_to_db
         self.post_count = 0
         self.reddit = self._initialize_reddit()
-        
+
+        self._buffer: list[dict] = []
+        self._buffer_lock = threading.Lock()
+        self._flush_size = flush_size
+        self._flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+        # One session reused across flushes; recycled only on error.
+        self._session = SessionLocal()
+        self._session_lock = threading.Lock()
+
+        try:
+            self.redis = redis.Redis.from_url(settings.redis_url)
+            self.redis.ping()
+        except redis.RedisError as e:
+            logger.warning(f"Redis unavailable, writing posts directly to database: {e}")
+            self.redis = None
+
+        self._bloom_available = False
+        if self.redis is not None:
+            try:
+                self.redis.execute_command(
+                    'BF.RESERVE', SEEN_POSTS_KEY,
+                    SEEN_POSTS_ERROR_RATE, SEEN_POSTS_CAPACITY
+                )
+                self._bloom_available = True
+            except redis.ResponseError as e:
+                if 'exists' in str(e).lower():
+                    self._bloom_available = True
+                else:
+                    # RedisBloom module not loaded; dedup falls back to the
+                    # ON CONFLICT guard in the batched inserter.
+                    logger.warning(f"RedisBloom unavailable, skipping in-stream dedup: {e}")
+            except redis.RedisError as e:
+                logger.warning(f"RedisBloom unavailable, skipping in-stream dedup: {e}")
+        self._stopped = threading.Event()
+        self._flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flush_thread.start()
+
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='post-worker')
+        self._backpressure = threading.BoundedSemaphore(max_pending_posts)
+
     def _initialize_reddit(self) -> praw.Reddit:
         """Initialize Reddit API client with credentials."""
         return praw.Reddit(
@@ -43,75 +191,175 @@ class RedditStreamListener:
             user_agent=settings.reddit_user_agent,
         )
     
+    def _is_duplicate(self, post_id: str) -> bool:
+        """Check-and-mark a post id against the Redis Bloom filter.
+
+        BF.ADD returns 0 when the id was (probably) already seen, letting
+        us drop retried/overlapping posts before they reach the database.
+        """
+        if not self._bloom_available:
+            return False
+        try:
+            return not self.redis.execute_command('BF.ADD', SEEN_POSTS_KEY, post_id)
+        except redis.RedisError as e:
+            logger.warning(f"Bloom filter check failed: {e}")
+            return False
+
     def process_submission(self, submission):
         """Process a Reddit submission (post)."""
         try:
-            post_data = {
-                'post_id': submission.id,
-                'text': f"{submission.title} {submission.selftext}".strip(),
-                'title': submission.title,
-                'created_at': datetime.fromtimestamp(submission.created_utc),
-                'author': str(submission.author) if submission.author else '[deleted]',
-                'subreddit': str(submission.subreddit),
-                'score': submission.score,
-                'num_comments': submission.num_comments,
-                'url': submission.url,
-                'post_type': 'submission',
-            }
-            
+            if self._is_duplicate(submission.id):
+                return
+
+            post_data = _submission_to_post(submission)
+
             self.post_count += 1
-            logger.info(f"Received submission #{self.post_count}: r/{post_data['subreddit']} - {post_data['title'][:50]}")
-            
-            if self.save_to_db:
-                self._save_to_database(post_data)
-            
-            if self.callback:
-                self.callback(post_data)
-                
+            if self.post_count % LOG_SAMPLE_EVERY == 0:
+                logger.info(
+                    "Received submission #%d: r/%s - %s",
+                    self.post_count, post_data['subreddit'], post_data['title'][:50]
+                )
+
+            self._dispatch(post_data)
+
         except Exception as e:
             logger.error(f"Error processing submission: {e}")
     
     def process_comment(self, comment):
         """Process a Reddit comment."""
         try:
-            post_data = {
-                'post_id': comment.id,
-                'text': comment.body,
-                'title': None,
-                'created_at': datetime.fromtimestamp(comment.created_utc),
-                'author': str(comment.author) if comment.author else '[deleted]',
-                'subreddit': str(comment.subreddit),
-                'score': comment.score,
-                'num_comments': 0,
-                'url': f"https://reddit.com{comment.permalink}",
-                'post_type': 'comment',
-            }
-            
+            if self._is_duplicate(comment.id):
+                return
+
+            post_data = _comment_to_post(comment)
+
             self.post_count += 1
-            logger.info(f"Received comment #{self.post_count}: r/{post_data['subreddit']} - {post_data['text'][:50]}")
-            
-            if self.save_to_db:
-                self._save_to_database(post_data)
-            
-            if self.callback:
-                self.callback(post_data)
-                
+            if self.post_count % LOG_SAMPLE_EVERY == 0:
+                logger.info(
+                    "Received comment #%d: r/%s - %s",
+                    self.post_count, post_data['subreddit'], post_data['text'][:50]
+                )
+
+            self._dispatch(post_data)
+
         except Exception as e:
             logger.error(f"Error processing comment: {e}")
     
-    def _save_to_database(self, post_data: dict):
-        """Save Reddit post to database."""
-        db = SessionLocal()
+    def _dispatch(self, post_data: dict):
+        """Hand persistence and the user callback to the worker pool.
+
+        The stream iterates on the caller's thread; keeping that thread to
+        a cheap enqueue stops a slow callback or DB hiccup from stalling
+        the network read. The bounded semaphore applies backpressure
+        instead of letting the pending queue grow without limit.
+        """
+        self._backpressure.acquire()
         try:
-            reddit_post = RedditPost(**post_data)
-            db.add(reddit_post)
-            db.commit()
-            logger.debug(f"Saved post {post_data['post_id']} to database")
+            self._pool.submit(self._process, post_data)
+        except RuntimeError:
+            self._backpressure.release()
+            raise
+
+    def _process(self, post_data: dict):
+        """Worker-side handling of one post: persist it and run the callback."""
+        try:
+            if self.save_to_db:
+                self._save_to_database(post_data)
+
+            if self.callback:
+                self.callback(post_data)
         except Exception as e:
-            logger.error(f"Error saving to database: {e}")
-            db.rollback()
+            logger.error(f"Error processing post {post_data.get('post_id')}: {e}")
         finally:
-            db.close()
+            self._backpressure.release()
+
+    def _save_to_database(self, post_data: dict):
+        """Queue a Reddit post for persistence.
+
+        Posts go to a Redis stream so the listener thread never waits on a
+        Postgres commit; the drain_post_stream Celery task moves them into
+        the database in batches. When Redis is unavailable we fall back to
+        the in-process buffer.
+        """
+        if self.redis is not None:
+            try:
+                self.redis.xadd(
+                    POST_STREAM_KEY,
+                    encode_post_fields(post_data),
+                    maxlen=POST_STREAM_MAXLEN,
+                    approximate=True
+                )
+                return
+            except redis.RedisError as e:
+                logger.error(f"Error queueing post to Redis stream: {e}")
+
+        self._buffer_post(post_data)
+
+    def _buffer_post(self, post_data: dict):
+        """Buffer a Reddit post for batched insertion into the database.
+
+        Writing one transaction per post means a connection checkout and
+        an fsync per message; buffering and flushing in batches amortizes
+        both across many posts.
+        """
+        batch = None
+        with self._buffer_lock:
+            self._buffer.append(post_data)
+            if (len(self._buffer) >= self._flush_size
+                    or time.monotonic() - self._last_flush > self._flush_interval):
+                batch = self._buffer
+                self._buffer = []
+                self._last_flush = time.monotonic()
+
+        if batch:
+            self._flush(batch)
+
+    def _flush(self, batch: list[dict]):
+        """Write a batch of buffered posts to the database in one transaction."""
+        if not batch:
+            return
+
+        with self._session_lock:
+            try:
+                insert_posts_ignore_duplicates(self._session, batch)
+                self._session.commit()
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Flushed %d posts to database", len(batch))
+            except Exception as e:
+                logger.error(f"Error saving batch to database: {e}")
+                self._session.rollback()
+                self._session.close()
+                self._session = SessionLocal()
+
+    def _flush_loop(self):
+        """Background flusher so low-volume streams still persist promptly."""
+        while not self._stopped.wait(timeout=1.0):
+            batch = None
+            with self._buffer_lock:
+                if self._buffer and time.monotonic() - self._last_flush > self._flush_interval:
+                    batch = self._buffer
+                    self._buffer = []
+                    self._last_flush = time.monotonic()
+
+            if batch:
+                self._flush(batch)
+
+    def flush(self):
+        """Drain any buffered posts to the database immediately."""
+        with self._buffer_lock:
+            batch = self._buffer
+            self._buffer = []
+            self._last_flush = time.monotonic()
+
+        self._flush(batch)
+
+    def close(self):
+        """Stop the workers and background flusher, drain remaining posts."""
+        self._pool.shutdown(wait=True)
+        self._stopped.set()
+        self.flush()
+        with self._session_lock:
+            self._session.close()
 
 
 class RedditStreamManager:
@@ -148,6 +396,12 @@ class RedditStreamManager:
         )
         self.reddit = self.listener.reddit
         return self.listener
+
+    def close(self):
+        """Drain and shut down the active listener, if any."""
+        if self.listener:
+            self.listener.close()
+            self.listener = None
     
     def stream_subreddit_submissions(
         self,
@@ -178,6 +432,8 @@ class RedditStreamManager:
                 self.listener.process_submission(submission)
         except Exception as e:
             logger.error(f"Error in submission stream: {e}")
+        finally:
+            self.listener.flush()
     
     def stream_subreddit_comments(
         self,
@@ -208,6 +464,8 @@ class RedditStreamManager:
                 self.listener.process_comment(comment)
         except Exception as e:
             logger.error(f"Error in comment stream: {e}")
+        finally:
+            self.listener.flush()
     
     def stream_subreddit_all(
         self,
@@ -285,27 +543,46 @@ class RedditStreamManager:
             self.listener.process_submission(submission)
 
 
-def create_batch_collector(batch_size: int = 100):
+def create_batch_collector(
+    batch_size: int = 100,
+    columns: tuple[str, ...] = ('post_id', 'text')
+):
     """
     Create a batch collector for efficient post processing.
-    
+
     Useful for batching posts before sending to model for sentiment analysis.
-    
+    Posts accumulate in a preallocated columnar buffer and a full batch is
+    handed off as a pyarrow.RecordBatch, so there is no per-flush list copy
+    and downstream consumers can build a datasets.Dataset directly via
+    pa.Table.from_batches without another pass over the rows.
+
     Args:
         batch_size: Number of posts to collect before processing
-        
+        columns: Post fields to carry into the batch
+
     Returns:
-        Callable that collects posts and returns batch when size is reached
+        Callable that collects posts and returns a RecordBatch when full
     """
-    batch = []
-    
+    builder = {column: [None] * batch_size for column in columns}
+    filled = 0
+    # Callbacks run concurrently on the listener's worker pool, so the
+    # index/buffer mutation has to be serialized.
+    lock = threading.Lock()
+
     def collect_batch(post_data: dict):
-        batch.append(post_data)
-        if len(batch) >= batch_size:
-            logger.info(f"Batch of {len(batch)} posts ready for processing")
-            processed_batch = batch.copy()
-            batch.clear()
-            return processed_batch
+        nonlocal filled
+        with lock:
+            for column in columns:
+                builder[column][filled] = post_data.get(column)
+            filled += 1
+
+            if filled == batch_size:
+                logger.info(f"Batch of {filled} posts ready for processing")
+                record_batch = pa.RecordBatch.from_pydict(builder)
+                # from_pydict copies into Arrow arrays, so the buffer slots
+                # can simply be overwritten on the next fill cycle.
+                filled = 0
+                return record_batch
         return None
-    
+
     return collect_batch
@@ -3,7 +3,18 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from config import settings
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+engine_kwargs = {'pool_pre_ping': True}
+if settings.database_url.startswith('postgresql'):
+    # psycopg2-only tuning: keep a warm pool for long-lived workers and
+    # batch multi-row INSERTs into few round-trips.
+    engine_kwargs.update(
+        pool_size=10,
+        pool_recycle=3600,
+        executemany_mode='values_plus_batch',
+        insertmanyvalues_page_size=1000,
+    )
+
+engine = create_engine(settings.database_url, **engine_kwargs)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -1,5 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Text, Boolean, JSON
-from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text, Boolean, JSON, Index, UniqueConstraint, func, text
 from src.database.database import Base
 
 
@@ -10,7 +9,7 @@ class Post(Base):
     id = Column(Integer, primary_key=True, index=True)
     post_id = Column(String, unique=True, index=True)
     text = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
     author_id = Column(String, nullable=True)
     lang = Column(String, nullable=True)
     preprocessed_text = Column(Text, nullable=True)
@@ -19,17 +18,28 @@ class Post(Base):
     confidence = Column(Float, nullable=True)
     model_version = Column(String, nullable=True)
     processed = Column(Boolean, default=False)
-    metadata = Column(JSON, nullable=True)
+    # 'metadata' is a reserved declarative attribute, so the Python name
+    # differs from the column name.
+    post_metadata = Column('metadata', JSON, nullable=True)
 
 
 class TrainingData(Base):
     __tablename__ = "training_data"
-    
+    __table_args__ = (
+        UniqueConstraint('text', 'source', name='uq_training_data_text_source'),
+        # Partial index so the retraining check counts unused rows without
+        # scanning the whole (growing) table.
+        Index(
+            'idx_training_data_unused', 'id',
+            postgresql_where=text('used_for_training = false')
+        ),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     text = Column(Text)
     label = Column(String)
     source = Column(String)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
     used_for_training = Column(Boolean, default=False)
     split = Column(String, nullable=True)
 
@@ -41,7 +51,7 @@ class RedditPost(Base):
     post_id = Column(String, unique=True, index=True)
     text = Column(Text)
     title = Column(String, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
     author = Column(String, nullable=True)
     subreddit = Column(String, index=True)
     score = Column(Integer, nullable=True)
@@ -54,7 +64,7 @@ class RedditPost(Base):
     confidence = Column(Float, nullable=True)
     model_version = Column(String, nullable=True)
     processed = Column(Boolean, default=False)
-    metadata = Column(JSON, nullable=True)
+    post_metadata = Column('metadata', JSON, nullable=True)
 
 
 class ModelMetrics(Base):
@@ -68,8 +78,8 @@ class ModelMetrics(Base):
     recall = Column(Float)
     f1_score = Column(Float)
     training_samples = Column(Integer)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=func.now())
     mlflow_run_id = Column(String, nullable=True)
     wandb_run_id = Column(String, nullable=True)
     is_deployed = Column(Boolean, default=False)
-    metadata = Column(JSON, nullable=True)
+    model_metadata = Column('metadata', JSON, nullable=True)
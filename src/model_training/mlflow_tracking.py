@@ -3,7 +3,6 @@ from typing import Any
 import logging
 from config import settings
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
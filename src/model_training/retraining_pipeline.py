@@ -1,7 +1,10 @@
 from datetime import datetime, timedelta
+import hashlib
 import logging
+from pathlib import Path
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, func, select, update
+from datasets import load_from_disk
 from src.database.database import SessionLocal
 from src.database.models import RedditPost, TrainingData, ModelMetrics
 from src.model_training.trainer import SentimentModelTrainer, sentiment_to_label
@@ -9,9 +12,24 @@ from src.model_training.mlflow_tracking import CombinedTracker
 from src.preprocessing.text_processor import preprocess_for_model
 from config import settings
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+PREPARED_DATA_DIR = Path("data/prepared")
+# Chunk id lists for bulk UPDATEs to stay under Postgres parameter limits.
+MARK_USED_CHUNK_SIZE = 10000
+
+
+def prepared_dataset_path(split: str = "train") -> Path:
+    """Path of the pre-tokenized dataset cache for the current tokenizer config.
+
+    The hash covers everything that invalidates cached token ids, so a
+    change of model or max_length transparently misses the cache.
+    """
+    ds_hash = hashlib.md5(
+        f"{settings.model_name}-{settings.max_length}-{split}".encode()
+    ).hexdigest()
+    return PREPARED_DATA_DIR / ds_hash
+
 
 class RetrainingPipeline:
     def __init__(
@@ -22,11 +40,17 @@ class RetrainingPipeline:
         self.min_samples = min_samples or settings.min_samples_for_retrain
         self.model_save_dir = model_save_dir
         self.tracker = CombinedTracker()
+        self._claimed_ids: list[int] = []
     
     def check_retraining_needed(self, db: Session) -> bool:
-        new_samples_count = db.query(TrainingData).filter(
-            TrainingData.used_for_training == False
-        ).count()
+        # Direct count against the partial index on unused rows; the ORM
+        # .count() wraps the query in a subquery the planner can't always
+        # collapse.
+        new_samples_count = db.execute(
+            select(func.count()).select_from(TrainingData).where(
+                TrainingData.used_for_training == False
+            )
+        ).scalar()
         
         logger.info(f"New training samples available: {new_samples_count}")
         
@@ -46,26 +70,94 @@ class RetrainingPipeline:
         
         return False
     
+    def _load_prepared_dataset(self) -> tuple | None:
+        """Load the pre-tokenized Arrow dataset cache, if one exists.
+
+        Returns (texts, labels, encodings) or None when no usable cache is
+        on disk. The DB remains the source of truth; the cache only skips
+        re-tokenizing the same corpus on every retraining cycle.
+        """
+        path = prepared_dataset_path()
+        if not path.exists() or not any(path.glob("*")):
+            return None
+
+        try:
+            dataset = load_from_disk(str(path))
+        except Exception as e:
+            logger.warning(f"Could not load prepared dataset from {path}: {e}")
+            return None
+
+        texts = dataset['text']
+        labels = dataset['label']
+        encodings = [
+            {'input_ids': input_ids, 'attention_mask': attention_mask}
+            for input_ids, attention_mask in zip(dataset['input_ids'], dataset['attention_mask'])
+        ]
+
+        logger.info(f"Loaded {len(texts)} pre-tokenized samples from {path}")
+        return texts, labels, encodings
+
+    def _claim_unused_rows(self, db: Session):
+        """Claim this cycle's unused rows in one short transaction.
+
+        SKIP LOCKED keeps a concurrent beat-triggered retrain from racing
+        us (ignored on sqlite, which has no row locks), and flipping
+        used_for_training immediately keeps the transaction short —
+        holding the row locks open for an hours-long training run would
+        pin a pool connection and trip idle-in-transaction timeouts.
+        release_claimed_data reverts the flip if the cycle fails.
+        """
+        claimed = db.query(TrainingData.id).filter(
+            TrainingData.used_for_training == False
+        ).with_for_update(skip_locked=True).all()
+        self._claimed_ids = [row.id for row in claimed]
+        self._set_used_flag(db, self._claimed_ids, True)
+        db.commit()
+
     def prepare_training_data(self, db: Session) -> tuple:
+        cached = self._load_prepared_dataset()
+        if cached is not None and len(cached[0]) >= self.min_samples:
+            # The DB stays the source of truth: a cache built before new
+            # labeled rows arrived would silently train on a frozen corpus,
+            # so it only short-circuits while the corpus hasn't grown.
+            labeled_count = db.execute(
+                select(func.count()).select_from(TrainingData).where(
+                    TrainingData.label.isnot(None)
+                )
+            ).scalar()
+            if labeled_count <= len(cached[0]):
+                # The cache path must claim too, or mark_data_as_used
+                # falls back to its blanket UPDATE and flips rows
+                # ingested while training ran.
+                self._claim_unused_rows(db)
+                return cached
+            logger.info(
+                f"Prepared dataset cache is stale ({len(cached[0])} cached vs "
+                f"{labeled_count} labeled rows); rebuilding from database"
+            )
+
         training_data = db.query(TrainingData).filter(
             TrainingData.label.isnot(None)
         ).all()
-        
+
         if len(training_data) < self.min_samples:
             logger.warning(f"Insufficient training data: {len(training_data)} samples")
-            return None, None
-        
+            return None, None, None
+
+        self._claim_unused_rows(db)
+
         texts = [preprocess_for_model(item.text) for item in training_data]
         labels = [sentiment_to_label(item.label) for item in training_data]
-        
+
         logger.info(f"Prepared {len(texts)} samples for training")
-        return texts, labels
+        return texts, labels, None
     
     def train_new_model(
         self,
         texts: list[str],
         labels: list[int],
-        version: str | None = None
+        version: str | None = None,
+        encodings: list[dict] | None = None
     ) -> dict:
         version = version or datetime.now().strftime("%Y%m%d_%H%M%S")
         
@@ -84,7 +176,9 @@ class RetrainingPipeline:
         
         trainer = SentimentModelTrainer()
         
-        train_dataset, val_dataset, test_dataset = trainer.prepare_data(texts, labels)
+        train_dataset, val_dataset, test_dataset = trainer.prepare_data(
+            texts, labels, encodings=encodings
+        )
         
         self.tracker.log_params({
             'train_samples': len(train_dataset),
@@ -146,12 +240,41 @@ class RetrainingPipeline:
         
         logger.info(f"Saved model metrics for version {training_result['version']}")
     
+    def _set_used_flag(self, db: Session, ids: list[int], used: bool):
+        # One UPDATE per id chunk so rows ingested while training ran are
+        # untouched and the statement stays under parameter limits.
+        for start in range(0, len(ids), MARK_USED_CHUNK_SIZE):
+            chunk = ids[start:start + MARK_USED_CHUNK_SIZE]
+            db.execute(
+                update(TrainingData.__table__)
+                .where(TrainingData.id.in_(chunk))
+                .values(used_for_training=used)
+            )
+
     def mark_data_as_used(self, db: Session):
-        db.query(TrainingData).filter(
-            TrainingData.used_for_training == False
-        ).update({'used_for_training': True})
+        if self._claimed_ids:
+            # The claimed rows were already flipped when they were claimed
+            # in prepare_training_data; just finalize the cycle.
+            marked = len(self._claimed_ids)
+            self._claimed_ids = []
+        else:
+            marked = db.query(TrainingData).filter(
+                TrainingData.used_for_training == False
+            ).update({'used_for_training': True})
+            db.commit()
+
+        logger.info(f"Marked {marked} training rows as used")
+
+    def release_claimed_data(self, db: Session):
+        """Return rows claimed by a failed cycle to the unused pool."""
+        if not self._claimed_ids:
+            return
+
+        released = len(self._claimed_ids)
+        self._set_used_flag(db, self._claimed_ids, False)
         db.commit()
-        logger.info("Marked training data as used")
+        self._claimed_ids = []
+        logger.info(f"Released {released} claimed training rows after failed cycle")
     
     def run_retraining_cycle(self) -> dict | None:
         db = SessionLocal()
@@ -162,11 +285,11 @@ class RetrainingPipeline:
             
             logger.info("Starting retraining cycle...")
             
-            texts, labels = self.prepare_training_data(db)
+            texts, labels, encodings = self.prepare_training_data(db)
             if texts is None:
                 return None
-            
-            training_result = self.train_new_model(texts, labels)
+
+            training_result = self.train_new_model(texts, labels, encodings=encodings)
             
             self.save_model_metrics(db, training_result)
             
@@ -177,6 +300,8 @@ class RetrainingPipeline:
             
         except Exception as e:
             logger.error(f"Error during retraining cycle: {e}")
+            db.rollback()
+            self.release_claimed_data(db)
             return None
         finally:
             db.close()
@@ -14,24 +14,47 @@ from datetime import datetime
 import logging
 from config import settings
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
 class SentimentDataset(Dataset):
-    def __init__(self, texts: list[str], labels: list[int], tokenizer, max_length: int = 128):
+    def __init__(
+        self,
+        texts: list[str],
+        labels: list[int],
+        tokenizer,
+        max_length: int = 128,
+        encodings: list[dict] | None = None
+    ):
         self.texts = texts
         self.labels = labels
         self.tokenizer = tokenizer
         self.max_length = max_length
-    
+        self.encodings = encodings
+
     def __len__(self):
         return len(self.texts)
-    
+
     def __getitem__(self, idx):
         text = str(self.texts[idx])
         label = self.labels[idx]
-        
+
+        if self.encodings is not None:
+            # Pre-tokenized path: pad/truncate the cached encoding instead
+            # of re-running the tokenizer on every epoch.
+            input_ids = list(self.encodings[idx]['input_ids'])[:self.max_length]
+            attention_mask = list(self.encodings[idx]['attention_mask'])[:self.max_length]
+            padding = self.max_length - len(input_ids)
+            if padding:
+                input_ids = input_ids + [self.tokenizer.pad_token_id] * padding
+                attention_mask = attention_mask + [0] * padding
+
+            return {
+                'input_ids': torch.tensor(input_ids, dtype=torch.long),
+                'attention_mask': torch.tensor(attention_mask, dtype=torch.long),
+                'labels': torch.tensor(label, dtype=torch.long)
+            }
+
         encoding = self.tokenizer(
             text,
             add_special_tokens=True,
@@ -73,19 +96,31 @@ class SentimentModelTrainer:
         texts: list[str],
         labels: list[int],
         test_size: float = 0.2,
-        val_size: float = 0.1
+        val_size: float = 0.1,
+        encodings: list[dict] | None = None
     ) -> tuple[SentimentDataset, SentimentDataset, SentimentDataset]:
-        X_train, X_test, y_train, y_test = train_test_split(
-            texts, labels, test_size=test_size, random_state=42, stratify=labels
-        )
-        
-        X_train, X_val, y_train, y_val = train_test_split(
-            X_train, y_train, test_size=val_size, random_state=42, stratify=y_train
-        )
-        
-        train_dataset = SentimentDataset(X_train, y_train, self.tokenizer, self.max_length)
-        val_dataset = SentimentDataset(X_val, y_val, self.tokenizer, self.max_length)
-        test_dataset = SentimentDataset(X_test, y_test, self.tokenizer, self.max_length)
+        if encodings is None:
+            X_train, X_test, y_train, y_test = train_test_split(
+                texts, labels, test_size=test_size, random_state=42, stratify=labels
+            )
+
+            X_train, X_val, y_train, y_val = train_test_split(
+                X_train, y_train, test_size=val_size, random_state=42, stratify=y_train
+            )
+
+            enc_train = enc_val = enc_test = None
+        else:
+            X_train, X_test, y_train, y_test, enc_train, enc_test = train_test_split(
+                texts, labels, encodings, test_size=test_size, random_state=42, stratify=labels
+            )
+
+            X_train, X_val, y_train, y_val, enc_train, enc_val = train_test_split(
+                X_train, y_train, enc_train, test_size=val_size, random_state=42, stratify=y_train
+            )
+
+        train_dataset = SentimentDataset(X_train, y_train, self.tokenizer, self.max_length, encodings=enc_train)
+        val_dataset = SentimentDataset(X_val, y_val, self.tokenizer, self.max_length, encodings=enc_val)
+        test_dataset = SentimentDataset(X_test, y_test, self.tokenizer, self.max_length, encodings=enc_test)
         
         logger.info(f"Train samples: {len(train_dataset)}, Val samples: {len(val_dataset)}, Test samples: {len(test_dataset)}")
         
@@ -1,26 +1,54 @@
 from celery import Celery
 from celery.schedules import crontab
-from config import settings
+from datetime import timedelta
+from kombu.serialization import register
+import orjson
+from config import settings, setup_logging
 import logging
 
-logging.basicConfig(level=logging.INFO)
+setup_logging()
 logger = logging.getLogger(__name__)
 
+# orjson is a C implementation of JSON; train_model_task payloads carry
+# thousands of texts, so encode/decode time on the broker path matters.
+register(
+    'orjson',
+    orjson.dumps,
+    orjson.loads,
+    content_type='application/x-orjson',
+    content_encoding='utf-8',
+)
+
 celery_app = Celery(
     'sentiment_analysis',
     broker=settings.redis_url,
-    backend=settings.redis_url
+    backend=settings.redis_url,
+    include=[
+        'src.tasks.training_tasks',
+        'src.tasks.monitoring_tasks',
+        'src.tasks.ingestion_tasks',
+    ]
 )
 
 celery_app.conf.update(
-    task_serializer='json',
-    accept_content=['json'],
-    result_serializer='json',
+    task_serializer='orjson',
+    accept_content=['orjson', 'json'],
+    result_serializer='orjson',
+    task_compression='zstd',
     timezone='UTC',
     enable_utc=True,
     task_track_started=True,
     task_time_limit=3600,
-    worker_prefetch_multiplier=1,
+    # Long-running training tasks and quick monitoring/ingest tasks get
+    # separate queues so prefetch can be tuned per worker: start training
+    # workers with -Q training --prefetch-multiplier=1 and fast workers
+    # with -Q fast --prefetch-multiplier=4.
+    task_routes={
+        'src.tasks.training_tasks.*': {'queue': 'training'},
+        'src.tasks.monitoring_tasks.*': {'queue': 'fast'},
+        'src.tasks.ingestion_tasks.*': {'queue': 'fast'},
+    },
+    task_default_queue='fast',
 )
 
 celery_app.conf.beat_schedule = {
@@ -32,6 +60,10 @@ celery_app.conf.beat_schedule = {
         'task': 'src.tasks.monitoring_tasks.monitor_data_quality',
         'schedule': crontab(minute='*/30'),
     },
+    'drain-post-stream': {
+        'task': 'src.tasks.ingestion_tasks.drain_post_stream',
+        'schedule': timedelta(seconds=5),
+    },
 }
 
 
@@ -0,0 +1,83 @@
+import logging
+import redis
+from src.tasks.celery_app import celery_app
+from src.data_ingestion.reddit_streamer import (
+    POST_STREAM_KEY,
+    decode_post_fields,
+    insert_posts_ignore_duplicates,
+)
+from src.database.database import SessionLocal
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+CONSUMER_GROUP = "post-writers"
+CONSUMER_NAME = "drain-post-stream"
+DRAIN_BATCH_SIZE = 500
+# Entries read but not acked (a previous drain crashed mid-batch) are
+# reclaimed once they have been pending this long.
+STALE_PENDING_MS = 60_000
+
+
+@celery_app.task
+def drain_post_stream():
+    """Drain queued Reddit posts from the Redis stream into the database.
+
+    The stream listener only does an XADD per post; this consumer moves
+    entries into Postgres in batches of up to DRAIN_BATCH_SIZE with a
+    single multi-row INSERT, then acknowledges and trims them.
+    """
+    client = redis.Redis.from_url(settings.redis_url)
+
+    try:
+        client.xgroup_create(POST_STREAM_KEY, CONSUMER_GROUP, id='0', mkstream=True)
+    except redis.ResponseError as e:
+        if 'BUSYGROUP' not in str(e):
+            raise
+
+    # Recover deliveries a crashed drain left in the pending entries list;
+    # without this, entries read with '>' but never acked would sit in the
+    # PEL forever and those posts would silently never be persisted.
+    try:
+        _, messages, _ = client.xautoclaim(
+            POST_STREAM_KEY,
+            CONSUMER_GROUP,
+            CONSUMER_NAME,
+            min_idle_time=STALE_PENDING_MS,
+            count=DRAIN_BATCH_SIZE
+        )
+    except redis.ResponseError as e:
+        logger.warning(f"Could not reclaim pending stream entries: {e}")
+        messages = []
+
+    if len(messages) < DRAIN_BATCH_SIZE:
+        entries = client.xreadgroup(
+            CONSUMER_GROUP,
+            CONSUMER_NAME,
+            {POST_STREAM_KEY: '>'},
+            count=DRAIN_BATCH_SIZE - len(messages)
+        )
+        if entries:
+            messages = messages + entries[0][1]
+
+    if not messages:
+        return {'drained': 0}
+    entry_ids = [entry_id for entry_id, _ in messages]
+    rows = [decode_post_fields(fields) for _, fields in messages]
+
+    db = SessionLocal()
+    try:
+        insert_posts_ignore_duplicates(db, rows)
+        db.commit()
+    except Exception as e:
+        logger.error(f"Error draining post stream to database: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    client.xack(POST_STREAM_KEY, CONSUMER_GROUP, *entry_ids)
+    client.xdel(POST_STREAM_KEY, *entry_ids)
+
+    logger.info(f"Drained {len(rows)} posts from stream")
+    return {'drained': len(rows)}
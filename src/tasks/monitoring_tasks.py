@@ -3,7 +3,6 @@ from src.model_training.retraining_pipeline import DataQualityMonitor
 from src.database.database import SessionLocal
 import logging
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
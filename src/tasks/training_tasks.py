@@ -1,18 +1,76 @@
 from src.tasks.celery_app import celery_app
 from src.model_training.retraining_pipeline import RetrainingPipeline
 from src.database.database import SessionLocal
+from config import settings
+from datasets import Dataset
+from transformers import AutoTokenizer
 import logging
+import multiprocessing
+import os
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_PIPELINE_CACHE: dict[str, RetrainingPipeline] = {}
+
+
+def _get_pipeline() -> RetrainingPipeline:
+    """Reuse one RetrainingPipeline per model name across task invocations.
+
+    Constructing the pipeline sets up experiment tracking; rebuilding it
+    per task makes cold-start dominate the short check_and_retrain runs.
+    """
+    return _PIPELINE_CACHE.setdefault(settings.model_name, RetrainingPipeline())
+
+
+def _map_num_proc() -> int | None:
+    """Worker count for datasets.map, or None to stay in-process.
+
+    Prefork Celery workers are daemonic and cannot spawn children
+    ("daemonic processes are not allowed to have children"), so the
+    multi-process map only kicks in under the solo-pool training worker.
+    os.cpu_count() can return None on exotic platforms.
+    """
+    if multiprocessing.current_process().daemon:
+        return None
+    cpus = os.cpu_count() or 1
+    if cpus <= 1:
+        return None
+    return cpus - 1
+
+
+def _tokenize_corpus(texts: list[str]) -> list[dict]:
+    """Tokenize the training corpus across CPU cores before training.
+
+    Tokenization is pure CPU and embarrassingly parallel; doing it here
+    with a multi-process map keeps the trainer from tokenizing the same
+    texts serially on every epoch.
+    """
+    tokenizer = AutoTokenizer.from_pretrained(settings.model_name)
+    dataset = Dataset.from_dict({'text': texts})
+    dataset = dataset.map(
+        lambda batch: tokenizer(
+            batch['text'],
+            truncation=True,
+            max_length=settings.max_length,
+            padding=False
+        ),
+        batched=True,
+        batch_size=1000,
+        num_proc=_map_num_proc()
+    )
+
+    return [
+        {'input_ids': input_ids, 'attention_mask': attention_mask}
+        for input_ids, attention_mask in zip(dataset['input_ids'], dataset['attention_mask'])
+    ]
+
 
 @celery_app.task(bind=True, max_retries=3)
 def check_and_retrain(self):
     logger.info("Checking if retraining is needed...")
     
     try:
-        pipeline = RetrainingPipeline()
+        pipeline = _get_pipeline()
         result = pipeline.run_retraining_cycle()
         
         if result:
@@ -35,8 +93,9 @@ def check_and_retrain(self):
 def train_model_task(texts, labels, version=None):
     logger.info(f"Training model with {len(texts)} samples...")
     
-    pipeline = RetrainingPipeline()
-    result = pipeline.train_new_model(texts, labels, version)
+    pipeline = _get_pipeline()
+    encodings = _tokenize_corpus(texts)
+    result = pipeline.train_new_model(texts, labels, version, encodings=encodings)
     
     db = SessionLocal()
     try:
@@ -0,0 +1,88 @@
+from datetime import datetime
+
+import pyarrow as pa
+
+from src.data_ingestion.reddit_streamer import (
+    POST_STREAM_FIELDS,
+    create_batch_collector,
+    decode_post_fields,
+    encode_post_fields,
+)
+
+
+def _as_redis_entry(fields: dict) -> dict:
+    """Redis returns stream entry fields as bytes."""
+    return {key.encode(): value.encode() for key, value in fields.items()}
+
+
+def test_post_fields_round_trip_submission():
+    post_data = {
+        'post_id': 'abc123',
+        'text': 'A title Some body text',
+        'title': 'A title',
+        'created_at': datetime(2026, 8, 30, 12, 0, 5),
+        'author': 'someone',
+        'subreddit': 'technology',
+        'score': 42,
+        'num_comments': 7,
+        'url': 'https://reddit.com/r/technology/abc123',
+        'post_type': 'submission',
+    }
+
+    decoded = decode_post_fields(_as_redis_entry(encode_post_fields(post_data)))
+
+    assert decoded == post_data
+
+
+def test_post_fields_round_trip_comment_restores_none():
+    # Comments have no title or url; the decoded row must still carry the
+    # keys so a mixed batch stays homogeneous for executemany.
+    post_data = {
+        'post_id': 'def456',
+        'text': 'a comment',
+        'title': None,
+        'created_at': datetime(2026, 8, 30, 12, 1, 0),
+        'author': None,
+        'subreddit': 'news',
+        'score': 3,
+        'num_comments': None,
+        'url': None,
+        'post_type': 'comment',
+    }
+
+    encoded = encode_post_fields(post_data)
+    assert 'title' not in encoded
+
+    decoded = decode_post_fields(_as_redis_entry(encoded))
+
+    assert decoded == post_data
+    assert set(decoded) == set(POST_STREAM_FIELDS)
+
+
+class TestCreateBatchCollector:
+    def test_returns_none_until_batch_is_full(self):
+        collect = create_batch_collector(batch_size=3)
+
+        assert collect({'post_id': 'a', 'text': 'one'}) is None
+        assert collect({'post_id': 'b', 'text': 'two'}) is None
+
+    def test_full_batch_is_a_record_batch(self):
+        collect = create_batch_collector(batch_size=2)
+
+        collect({'post_id': 'a', 'text': 'one'})
+        batch = collect({'post_id': 'b', 'text': 'two'})
+
+        assert isinstance(batch, pa.RecordBatch)
+        assert batch.num_rows == 2
+        assert batch.column('post_id').to_pylist() == ['a', 'b']
+        assert batch.column('text').to_pylist() == ['one', 'two']
+
+    def test_collector_keeps_collecting_after_a_flush(self):
+        collect = create_batch_collector(batch_size=2)
+
+        collect({'post_id': 'a', 'text': 'one'})
+        collect({'post_id': 'b', 'text': 'two'})
+
+        assert collect({'post_id': 'c', 'text': 'three'}) is None
+        batch = collect({'post_id': 'd', 'text': 'four'})
+        assert batch.column('post_id').to_pylist() == ['c', 'd']
@@ -35,7 +35,26 @@ class TestSentimentModelTrainer:
         train_dataset, val_dataset, test_dataset = trainer.prepare_data(
             texts, labels, test_size=0.2, val_size=0.1
         )
-        
+
         assert len(train_dataset) > 0
         assert len(val_dataset) > 0
         assert len(test_dataset) > 0
+
+    def test_prepare_data_with_encodings(self):
+        trainer = SentimentModelTrainer()
+        texts = ["Great!", "Terrible!", "Okay"] * 50
+        labels = [2, 0, 1] * 50
+        encodings = [
+            {'input_ids': [101, 102], 'attention_mask': [1, 1]}
+            for _ in texts
+        ]
+
+        train_dataset, val_dataset, test_dataset = trainer.prepare_data(
+            texts, labels, test_size=0.2, val_size=0.1, encodings=encodings
+        )
+
+        assert len(train_dataset) + len(val_dataset) + len(test_dataset) == len(texts)
+
+        item = train_dataset[0]
+        assert item['input_ids'].shape[0] == trainer.max_length
+        assert item['attention_mask'].shape[0] == trainer.max_length